@@ -1,15 +1,211 @@
 import scrapy
 from scrapy.crawler import CrawlerProcess
 import csv
+import io
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from hashlib import blake2b
 from ftfy import fix_text
+from lxml import etree
+from lxml.cssselect import CSSSelector
 from datetime import datetime
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-from collections import OrderedDict
 from pathlib import Path
+from zipfile import ZipFile, ZIP_DEFLATED
+
+_NUM_RE = re.compile(r"[\d\.,]+")
+_PAGE_RE = re.compile(r"/page/(\d+)/?")
+
+_PRODUCT_SEL = CSSSelector("li.product.type-product")
+_TITLE_SEL = CSSSelector("h2.woocommerce-loop-product__title")
+_PRICE_SEL = CSSSelector("span.woocommerce-Price-amount.amount")
+_IMAGE_SEL = CSSSelector("img.attachment-woocommerce_thumbnail")
+_NEXT_SEL = CSSSelector("a.next.page-numbers, a.next")
+_PAGE_LINK_SEL = CSSSelector("a.page-numbers")
+
+def _fix(text):
+    """Run ftfy unless the text is plain printable ASCII with no HTML entities."""
+    # ftfy also decodes entities and strips control characters in ASCII input
+    if text.isascii() and "&" not in text and text.isprintable():
+        return text
+    return fix_text(text)
+
+@lru_cache(maxsize=4096)
+def _amount_value(amount_text):
+    """Numeric value of a raw amount string, or None; cached since shop prices repeat."""
+    m = _NUM_RE.search(_fix(amount_text))
+    if not m:
+        return None
+
+    num_str = m.group(0).replace(",", "")
+    try:
+        return float(num_str)
+    except Exception:
+        return None
+
+HEADERS = ("Name", "Price", "Image")
+
+# ---------- minimal XLSX writer ----------
+# The export is a single sheet with a fixed three-column layout, so the
+# workbook parts are emitted directly instead of going through a library.
+
+# escape XML metacharacters and drop the characters XML cannot carry:
+# C0 controls other than tab/newline/CR, lone surrogates, U+FFFE and U+FFFF
+_XML_ESCAPE = str.maketrans({
+    "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;",
+    **{chr(c): None for c in range(32) if c not in (9, 10, 13)},
+    **{chr(c): None for c in range(0xD800, 0xE000)},
+    "\ufffe": None, "\uffff": None,
+})
+# Excel decodes literal _xHHHH_ in strings, so protect the underscore as
+# openpyxl and xlsxwriter do
+_XLSX_ESCAPED_RE = re.compile(r"_(x[0-9A-Fa-f]{4}_)")
+
+# cellXfs indices defined in _STYLES_XML
+_S_HEADER, _S_META = 1, 8
+# (text, price, N/A) styles for plain and alternate rows
+_ROW_STYLES = ((2, 3, 4), (5, 6, 7))
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Products" sheetId="1" r:id="rId1"/></sheets>'
+    '<definedNames><definedName name="_xlnm._FilterDatabase" localSheetId="0" hidden="1">'
+    "'Products'!$A$1:$C${last_row}</definedName></definedNames>"
+    '</workbook>'
+)
+
+_MEDIUM_BORDER = '<border><left style="medium"/><right style="medium"/><top style="medium"/><bottom style="medium"/><diagonal/></border>'
+
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="{price_fmt}"/></numFmts>'
+    '<fonts count="3">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><i/><sz val="11"/><color rgb="FF808080"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="4">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF1F4E78"/><bgColor indexed="64"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFF5F5F5"/><bgColor indexed="64"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>' + _MEDIUM_BORDER + '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="9">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="1" xfId="0" applyNumberFormat="1" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="3" borderId="1" xfId="0" applyFill="1" applyBorder="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="3" borderId="1" xfId="0" applyNumberFormat="1" applyFill="1" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="2" fillId="3" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+def _str_cell(ref, text, style):
+    text = text.translate(_XML_ESCAPE)
+    if "_x" in text:
+        text = _XLSX_ESCAPED_RE.sub(r"_x005F_\1", text)
+    return f'<c r="{ref}" s="{style}" t="inlineStr"><is><t>{text}</t></is></c>'
+
+def _stream_xlsx(path, rows, price_fmt, note):
+    """Write rows (records with Name/PriceDisplay/PriceNumeric/Image) as a styled one-sheet workbook."""
+    last_row = len(rows) + 1
+    meta_row = last_row + 2
+
+    # <cols> precedes <sheetData>, so widths are measured before streaming rows
+    max_w = [len(h) for h in HEADERS]
+    for it in rows:
+        max_w[0] = max(max_w[0], len(it["Name"]))
+        max_w[1] = max(max_w[1], len(it["PriceDisplay"]))
+        max_w[2] = max(max_w[2], len(it["Image"]))
+    cols = "".join(
+        f'<col min="{i}" max="{i}" width="{max(12, min(w * 1.2, 80)):.2f}" customWidth="1"/>'
+        for i, w in enumerate(max_w, start=1)
+    )
+
+    with ZipFile(path, "w", ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+        zf.writestr("_rels/.rels", _ROOT_RELS_XML)
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS_XML)
+        zf.writestr("xl/workbook.xml", _WORKBOOK_XML.replace("{last_row}", str(last_row)))
+        zf.writestr("xl/styles.xml", _STYLES_XML.replace("{price_fmt}", price_fmt.translate(_XML_ESCAPE)))
+
+        with zf.open("xl/worksheets/sheet1.xml", "w") as raw, io.TextIOWrapper(raw, encoding="utf-8") as f:
+            f.write(
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                f'<dimension ref="A1:C{meta_row}"/>'
+                '<sheetViews><sheetView tabSelected="1" workbookViewId="0">'
+                '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                '<selection pane="bottomLeft" activeCell="A2" sqref="A2"/>'
+                '</sheetView></sheetViews>'
+                '<sheetFormatPr defaultRowHeight="15"/>'
+                f'<cols>{cols}</cols><sheetData>'
+            )
+            f.write('<row r="1">' + "".join(_str_cell(f"{c}1", h, _S_HEADER) for c, h in zip("ABC", HEADERS)) + "</row>")
+
+            for i, it in enumerate(rows, start=2):
+                name = it["Name"]
+                image = it["Image"]
+                price_num = it["PriceNumeric"]
+
+                text_s, price_s, na_s = _ROW_STYLES[i % 2 == 0]
+                if price_num is not None:
+                    price_cell = f'<c r="B{i}" s="{price_s}"><v>{price_num!r}</v></c>'
+                else:
+                    price_cell = _str_cell(f"B{i}", "N/A", na_s)
+                f.write(
+                    f'<row r="{i}">'
+                    + _str_cell(f"A{i}", name, na_s if name == "N/A" else text_s)
+                    + price_cell
+                    + _str_cell(f"C{i}", image, na_s if image == "N/A" else text_s)
+                    + "</row>"
+                )
+
+            f.write(
+                f'<row r="{meta_row}">{_str_cell(f"A{meta_row}", note, _S_META)}</row>'
+                '</sheetData>'
+                f'<autoFilter ref="A1:C{last_row}"/>'
+                f'<mergeCells count="1"><mergeCell ref="A{meta_row}:C{meta_row}"/></mergeCells>'
+                '</worksheet>'
+            )
 
 class ShopSpider(scrapy.Spider):
     name = "shop_spider"
@@ -17,16 +213,25 @@ class ShopSpider(scrapy.Spider):
 
     custom_settings = {
         "LOG_LEVEL": "INFO",
-        "AUTOTHROTTLE_ENABLED": False,
-        "CONCURRENT_REQUESTS": 1,   # ensure strict sequential crawling
+        # pages are fetched concurrently; output order is restored per page number
+        "AUTOTHROTTLE_ENABLED": True,
+        "AUTOTHROTTLE_START_DELAY": 0.5,
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": 8,
+        "CONCURRENT_REQUESTS": 8,
     }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         today = datetime.now().strftime("%Y-%m-%d")
-        self.items = OrderedDict()
-        self.seq = 0
+        # unique records in scrape order, plus fingerprint -> index into it
+        self._storage: list[dict] = []
+        self._index: dict[bytes, int] = {}
+        # pages that arrived ahead of their turn, keyed by page number
+        self._pending: dict[int, list] = {}
+        self._next_page = 1
+        self._fanned_out = False
         self.currency_symbol = "$"
+        self._price_fmt = f"{self.currency_symbol}#,##0.00"
         self.csv_file = Path(f"pokemon_{today}.csv")
         self.xlsx_file = Path(f"pokemon_{today}.xlsx")
 
@@ -35,189 +240,162 @@ class ShopSpider(scrapy.Spider):
         """Normalize whitespace and fix encoding glitches."""
         if not text:
             return ""
-        return fix_text(re.sub(r"\s+", " ", text).strip())
+        return _fix(" ".join(text.split()))
 
-    def parse_price(self, price_block):
+    def parse_price(self, price_spans):
         """Extract numeric price and display string with $ currency."""
-        if not price_block:
+        if not price_spans:
             return "N/A", None
 
-        currency = price_block.css("span.woocommerce-Price-currencySymbol::text").get(default="").strip()
-        amount_text_nodes = price_block.xpath("text()").getall()
-        amount_text = " ".join([a for a in amount_text_nodes]).strip() or price_block.get() or ""
-        currency = fix_text(currency or self.currency_symbol)
-        amount_text = fix_text(amount_text)
-
-        m = re.search(r"[\d\.,]+", amount_text)
-        if not m:
-            return "N/A", None
+        # direct text of the amount spans, i.e. without the currency symbol
+        amount_text_nodes = [t for span in price_spans for t in (span.text, *(c.tail for c in span)) if t]
+        amount_text = " ".join(amount_text_nodes).strip() or "".join(price_spans[0].itertext())
+        return self.parse_amount(amount_text)
 
-        num_str = m.group(0).replace(",", "")
-        try:
-            num = float(num_str)
-        except Exception:
+    def parse_amount(self, amount_text):
+        """Turn a raw amount string like '63.00' into (display, numeric)."""
+        num = _amount_value(amount_text)
+        if num is None:
             return "N/A", None
 
-        display = f"{self.currency_symbol}{num:,.2f}"
+        display = self.currency_symbol + format(num, ",.2f")
         return display, num
 
+    def extract_product(self, product):
+        """Pull the raw name, parsed price and raw image URL from one product <li>."""
+        title = _TITLE_SEL(product)
+        img = _IMAGE_SEL(product)
+        # first direct text node, like parsel's ::text, even after a leading child
+        name_nodes = title[0].xpath("text()") if title else []
+        name = str(name_nodes[0]) if name_nodes else ""
+        image = img[0].get("src", "") if img else ""
+        return name, self.parse_price(_PRICE_SEL(product)), image
+
+    def page_number(self, url):
+        """Page number from a '/page/N/' URL; the shop root is page 1."""
+        m = _PAGE_RE.search(url)
+        return int(m.group(1)) if m else 1
+
+    def store_page(self, page, rows):
+        """Buffer a page's rows, then commit every page that is now in order."""
+        self._pending[page] = rows
+        while self._next_page in self._pending:
+            self.commit_rows(self._pending.pop(self._next_page))
+            self._next_page += 1
+
+    def commit_rows(self, rows):
+        """Append (fingerprint, record) rows whose fingerprint is new."""
+        for fp, record in rows:
+            if fp in self._index:
+                continue
+            self._index[fp] = len(self._storage)
+            self._storage.append(record)
+
     # ---------- parse ----------
     def parse(self, response):
         self.logger.info(f"Scraping page: {response.url}")
-        products = response.css("li.product.type-product")
+        page = self.page_number(response.url) if self._fanned_out else self._next_page
+        # Plain lxml tree with precompiled selectors; parsel is never built
+        root = etree.fromstring(response.body, etree.HTMLParser(encoding=response.encoding))
+        if root is None:
+            # empty body: nothing to scrape, but later pages must not wait on it
+            self.logger.warning(f"Empty response body for {response.url}")
+            self.store_page(page, [])
+            return
+        products = _PRODUCT_SEL(root)
         self.logger.info(f"Found {len(products)} products on {response.url}")
 
+        page_rows = []
         for product in products:
-            self.seq += 1
-            seq = self.seq
+            name, (price_display, price_num), image = self.extract_product(product)
+
+            name = self.clean_text(name) or "N/A"
+            price_display = price_display or "N/A"
+            image = self.clean_text(image) or "N/A"
+
+            # skip entirely empty rows
+            if name == "N/A" and price_display == "N/A" and image == "N/A":
+                continue
 
-            name = self.clean_text(product.css("h2.woocommerce-loop-product__title::text").get(default=""))
-            price_block = product.css("span.woocommerce-Price-amount.amount")
-            price_display, price_num = self.parse_price(price_block)
-            image = self.clean_text(product.css("img.attachment-woocommerce_thumbnail::attr(src)").get(default=""))
+            # 16-byte dedup key instead of a tuple of the three strings
+            fp = blake2b(b"\0".join((name.encode(), price_display.encode(), image.encode())), digest_size=16).digest()
 
             record = {
-                "Name": name or "",
-                "PriceDisplay": price_display if price_display else "",
+                "Name": name,
+                "PriceDisplay": price_display,
                 "PriceNumeric": price_num,
-                "Image": image or "",
+                "Image": image,
             }
 
-            self.items[seq] = record
-
-        # Pagination: sequential follow-up
-        next_page = response.css("a.next.page-numbers::attr(href), a.next::attr(href)").get()
-        if next_page:
-            self.logger.info(f"➡️ Proceeding to next page: {next_page}")
-            yield scrapy.Request(
-                url=response.urljoin(next_page),
-                callback=self.parse,
-                priority=-1,
-                dont_filter=True,
-            )
+            page_rows.append((fp, record))
+
+        self.store_page(page, page_rows)
+
+        # Pagination: the first page queues every page up to the last one linked
+        # so they are fetched concurrently; priority=-n makes the scheduler hand
+        # them out in ascending order, so the reorder buffer drains as it goes
+        if page == 1:
+            page_links = [a.get("href") for a in _PAGE_LINK_SEL(root) if a.get("href")]
+            last_link = max(page_links, key=self.page_number, default=None)
+            last_url = response.urljoin(last_link) if last_link else ""
+            if last_url and self.page_number(last_url) > 1:
+                for n in range(2, self.page_number(last_url) + 1):
+                    yield scrapy.Request(
+                        url=_PAGE_RE.sub(f"/page/{n}/", last_url, count=1),
+                        callback=self.parse,
+                        priority=-n,
+                    )
+                self._fanned_out = True
+
+        # Without numbered links, fall back to following "next" one page at a time
+        if not self._fanned_out:
+            next_page = next((a.get("href") for a in _NEXT_SEL(root) if a.get("href")), None)
+            if next_page:
+                self.logger.info(f"➡️ Proceeding to next page: {next_page}")
+                yield scrapy.Request(url=response.urljoin(next_page), callback=self.parse, priority=-(page + 1))
 
     # ---------- finalize ----------
-    def closed(self, reason):
-        keys_csv = ["Name", "Price", "Image"]
-        cleaned = []
-        seen = set()
-
-        for seq in self.items.keys():
-            it = self.items[seq]
-            name = self.clean_text(it.get("Name", "")) or "N/A"
-            image = self.clean_text(it.get("Image", "")) or "N/A"
-            price_display = it.get("PriceDisplay") or "N/A"
-            price_num = it.get("PriceNumeric")
-
-            row_tuple = (name, price_display, image)
-            if row_tuple in seen:
-                continue
-            seen.add(row_tuple)
-
-            cleaned.append({
-                "Name": name,
-                "Price": price_display,
-                "PriceNumeric": price_num,
-                "Image": image,
-            })
-
-        # remove entirely empty rows
-        filtered = [
-            r for r in cleaned
-            if not all((v == "N/A" or v == "" or v is None) for v in (r["Name"], r["Price"], r["Image"]))
-        ]
-
-        # Preserve exact order (no sorting)
-        filtered = list(filtered)
-
-        # Ensure overwrite safety
-        for file in [self.csv_file, self.xlsx_file]:
-            if file.exists():
-                os.remove(file)
-
-        # --- Write CSV ---
-        with open(self.csv_file, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.DictWriter(f, fieldnames=keys_csv, quoting=csv.QUOTE_ALL)
-            writer.writeheader()
-            for r in filtered:
-                writer.writerow({
-                    "Name": r["Name"] or "N/A",
-                    "Price": r["Price"] or "N/A",
-                    "Image": r["Image"] or "N/A",
-                })
-
-        # --- Excel formatting ---
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Products"
-
-        header_fill = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        header_align = Alignment(horizontal="center", vertical="center")
-        border = Border(
-            left=Side(style="medium"),
-            right=Side(style="medium"),
-            top=Side(style="medium"),
-            bottom=Side(style="medium"),
-        )
-        alt_fill = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
-        na_font = Font(color="808080", italic=True)
-
-        headers = ["Name", "Price", "Image"]
-        for col_idx, h in enumerate(headers, start=1):
-            cell = ws.cell(row=1, column=col_idx, value=h)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_align
-            cell.border = border
-
-        for r_idx, r in enumerate(filtered, start=2):
-            cell_name = ws.cell(row=r_idx, column=1, value=r["Name"] or "N/A")
-            cell_name.border = border
-            if r_idx % 2 == 0:
-                cell_name.fill = alt_fill
-            if cell_name.value == "N/A":
-                cell_name.font = na_font
-
-            if r["PriceNumeric"] is not None:
-                cell_price = ws.cell(row=r_idx, column=2, value=r["PriceNumeric"])
-                cell_price.number_format = f'{self.currency_symbol}#,##0.00'
-            else:
-                cell_price = ws.cell(row=r_idx, column=2, value="N/A")
-                cell_price.font = na_font
-
-            cell_price.border = border
-            if r_idx % 2 == 0:
-                cell_price.fill = alt_fill
-
-            cell_img = ws.cell(row=r_idx, column=3, value=r["Image"] or "N/A")
-            cell_img.border = border
-            if r_idx % 2 == 0:
-                cell_img.fill = alt_fill
-            if cell_img.value == "N/A":
-                cell_img.font = na_font
-
-        # --- Auto-fit columns ---
-        for col in ws.columns:
-            max_length = 0
-            col_letter = get_column_letter(col[0].column)
-            for cell in col:
-                text = f"{self.currency_symbol}{cell.value:,.2f}" if cell.column == 2 and isinstance(cell.value, (int, float)) else str(cell.value or "")
-                max_length = max(max_length, len(text) * 1.2)
-            ws.column_dimensions[col_letter].width = max(12, min(max_length, 80))
-
-        ws.freeze_panes = "A2"
-        ws.auto_filter.ref = ws.dimensions
-
-        meta_row = len(filtered) + 3
+    def write_csv(self, rows):
+        """Write rows to the CSV export."""
+        tmp = self.csv_file.with_suffix(self.csv_file.suffix + ".tmp")
+        try:
+            with open(tmp, "w", newline="", encoding="utf-8-sig", buffering=1 << 20) as f:
+                writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+                writer.writerow(HEADERS)
+                writer.writerows((it["Name"], it["PriceDisplay"], it["Image"]) for it in rows)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        os.replace(tmp, self.csv_file)
+
+    def write_xlsx(self, rows):
+        """Write rows to the formatted Excel export."""
+        tmp = self.xlsx_file.with_suffix(self.xlsx_file.suffix + ".tmp")
         note = f"📊 Sourced from (https://scrapeme.live/shop/) — {datetime.now():%Y-%m-%d %H:%M:%S}"
-        meta_cell = ws.cell(row=meta_row, column=1, value=note)
-        meta_cell.font = Font(color="808080", italic=True)
-        ws.merge_cells(start_row=meta_row, start_column=1, end_row=meta_row, end_column=len(headers))
-
-        wb.save(self.xlsx_file)
+        try:
+            _stream_xlsx(tmp, rows, self._price_fmt, note)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        os.replace(tmp, self.xlsx_file)
 
-        self.logger.info(f"Wrote {len(filtered)} products sequentially to {self.csv_file.resolve()} and {self.xlsx_file.resolve()} ({reason})")
+    def closed(self, reason):
+        # Pages stuck behind a missing one are still written, in page order
+        if self._pending:
+            self.logger.warning(f"Page {self._next_page} never arrived; writing pages {sorted(self._pending)} anyway")
+            for page in sorted(self._pending):
+                self.commit_rows(self._pending.pop(page))
+
+        # Records are already unique and non-empty; the two exports are
+        # independent, so the CSV is written while the XLSX is compressed
+        rows = self._storage
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            csv_job = ex.submit(self.write_csv, rows)
+            xlsx_job = ex.submit(self.write_xlsx, rows)
+            csv_job.result()
+            xlsx_job.result()
+
+        self.logger.info(f"Wrote {len(rows)} products sequentially to {self.csv_file.resolve()} and {self.xlsx_file.resolve()} ({reason})")
 
 if __name__ == "__main__":
     process = CrawlerProcess()